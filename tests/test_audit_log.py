@@ -0,0 +1,173 @@
+"""Unit tests for the background audit log writer."""
+import gzip
+import json
+
+import pytest
+
+from webapp import audit_log
+from webapp.audit_log import AuditLogWriter, lookup
+
+
+def _read_segments(directory):
+    records = []
+    for path in sorted(directory.glob("transcript-*.jsonl.gz")):
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            records.extend(json.loads(line) for line in f)
+    return records
+
+
+class TestAuditLogWriter:
+    def test_events_written_to_compressed_segment(self, tmp_path):
+        writer = AuditLogWriter(tmp_path, flush_interval=0.05)
+        writer.emit("turn", "sess-1", message="Build a portfolio")
+        writer.emit("mandate", "sess-1", export_id="abc", mandate={"fund": "X"})
+        writer.close()
+
+        records = _read_segments(tmp_path)
+        assert [r["event"] for r in records] == ["turn", "mandate"]
+        assert records[1]["mandate"] == {"fund": "X"}
+        assert writer.stats()["written"] == 2
+
+    def test_lookup_by_session_and_export_id(self, tmp_path):
+        writer = AuditLogWriter(tmp_path, flush_interval=0.05)
+        writer.emit("turn", "sess-1", message="a")
+        writer.emit("turn", "sess-2", message="b")
+        writer.emit("mandate", "sess-2", export_id="exp-9", mandate={})
+        writer.close()
+
+        assert [r["message"] for r in lookup(tmp_path, session_id="sess-2") if "message" in r] == ["b"]
+        by_export = lookup(tmp_path, export_id="exp-9")
+        assert len(by_export) == 1
+        assert by_export[0]["session_id"] == "sess-2"
+
+    def test_segments_rotate_by_size(self, tmp_path):
+        writer = AuditLogWriter(tmp_path, batch_size=1, flush_interval=0.05, segment_max_bytes=1)
+        for i in range(3):
+            writer.emit("turn", "sess-1", n=i)
+        writer.close()
+
+        assert len(list(tmp_path.glob("transcript-*.jsonl.gz"))) == 3
+        assert [r["n"] for r in lookup(tmp_path, session_id="sess-1")] == [0, 1, 2]
+
+    def test_full_queue_drops_without_blocking(self, tmp_path):
+        writer = AuditLogWriter(tmp_path, max_queue=1)
+        writer._closed.set()  # Stop the writer draining so the queue stays full
+        writer._thread.join()
+        writer._closed.clear()
+
+        assert writer.emit("turn", "s", n=1) is True
+        assert writer.emit("turn", "s", n=2) is False
+        assert writer.stats()["dropped"] == 1
+        assert writer.stats()["queued"] == 1
+
+    def test_emit_after_close_is_dropped(self, tmp_path):
+        writer = AuditLogWriter(tmp_path, flush_interval=0.05)
+        writer.close()
+        assert writer.emit("turn", "s") is False
+        assert writer.stats()["dropped"] == 1
+
+
+class TestSharedWriter:
+    def test_disabled_without_env(self, monkeypatch):
+        monkeypatch.delenv("QPORT_AUDIT_LOG_DIR", raising=False)
+        assert audit_log.get_audit_log() is None
+
+    def test_enabled_with_env(self, monkeypatch, tmp_path):
+        monkeypatch.setenv("QPORT_AUDIT_LOG_DIR", str(tmp_path))
+        monkeypatch.setattr(audit_log, "_shared_writer", None)
+        writer = audit_log.get_audit_log()
+        try:
+            assert writer is not None
+            assert audit_log.get_audit_log() is writer
+        finally:
+            writer.close()
+
+
+class TestIndexFailure:
+    def test_index_failure_retried_on_next_batch(self, tmp_path, monkeypatch):
+        writer = AuditLogWriter(tmp_path, flush_interval=0.05)
+        writer._closed.set()  # Drive batches by hand
+        writer._thread.join()
+
+        real_open = open
+        calls = {"n": 0}
+
+        def flaky_open(path, *args, **kwargs):
+            if str(path).endswith("index.jsonl") and calls["n"] == 0:
+                calls["n"] += 1
+                raise OSError("disk full")
+            return real_open(path, *args, **kwargs)
+
+        monkeypatch.setattr("builtins.open", flaky_open)
+        writer._write_batch([{"ts": 1.0, "event": "turn", "session_id": "s", "n": 1}])
+        writer._flush_index()
+        stats = writer.stats()
+        assert stats["written"] == 1
+        assert stats["failed"] == 0
+        assert stats["index_failed"] == 1
+        assert stats["unindexed"] == 1
+
+        writer._write_batch([{"ts": 2.0, "event": "turn", "session_id": "s", "n": 2}])
+        writer._flush_index()
+        assert writer.stats()["unindexed"] == 0
+        assert [r["n"] for r in lookup(tmp_path, session_id="s")] == [1, 2]
+
+
+def _manual_writer(tmp_path):
+    """Writer whose thread is stopped, so batches are driven by the test."""
+    writer = AuditLogWriter(tmp_path, flush_interval=0.05)
+    writer._closed.set()
+    writer._thread.join()
+    return writer
+
+
+def _events(session_id, *names):
+    return [{"ts": 1.0, "event": "turn", "session_id": session_id, "name": n} for n in names]
+
+
+class TestSegmentFailure:
+    def test_partial_segment_write_rotates(self, tmp_path, monkeypatch):
+        writer = _manual_writer(tmp_path)
+        writer._write_batch(_events("s1", "a", "b"))
+        writer._flush_index()
+
+        real_gzip_open = gzip.open
+
+        class PartialWrite:
+            def __init__(self, f):
+                self._f = f
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                self._f.close()
+
+            def writelines(self, lines):
+                self._f.write(lines[0])
+                raise OSError("disk full")
+
+        monkeypatch.setattr(
+            audit_log.gzip, "open",
+            lambda path, mode="rb", **kw: PartialWrite(real_gzip_open(path, mode, **kw)),
+        )
+        with pytest.raises(OSError):
+            writer._write_batch(_events("s2", "c", "d"))
+        monkeypatch.setattr(audit_log.gzip, "open", real_gzip_open)
+
+        writer._write_batch(_events("s3", "e", "f"))
+        writer._flush_index()
+
+        assert [r["name"] for r in lookup(tmp_path, session_id="s3")] == ["e", "f"]
+        assert [r["name"] for r in lookup(tmp_path, session_id="s1")] == ["a", "b"]
+        assert len(list(tmp_path.glob("transcript-*.jsonl.gz"))) == 2
+
+
+class TestIndexFragment:
+    def test_append_after_crash_fragment_starts_new_line(self, tmp_path):
+        (tmp_path / "index.jsonl").write_text('{"session_id": "s0", "seg')  # Crashed append
+        writer = _manual_writer(tmp_path)
+        writer._write_batch(_events("s1", "a"))
+        writer._flush_index()
+
+        assert [r["name"] for r in lookup(tmp_path, session_id="s1")] == ["a"]
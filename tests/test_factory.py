@@ -4,7 +4,7 @@ from dataclasses import dataclass, field
 from typing import Any
 from unittest.mock import MagicMock
 
-from webapp.factory import _LLMClientAdapter
+from webapp.factory import _LLMClientAdapter, ModelRoutingPolicy
 from qport_agent.llm.client import AgentMessage, ToolCall as QportToolCall
 
 
@@ -160,3 +160,297 @@ class TestLLMClientAdapter:
         adapter2 = _LLMClientAdapter(MockEnhancedClient(response2))
         result2 = adapter2.send(messages=[], system="", tools=[])
         assert result2.has_tool_calls is False
+
+
+# ── Model Routing ────────────────────────────────────────────────
+
+
+class TestModelRoutingPolicy:
+    @pytest.mark.parametrize("state,section,tier", [
+        ("idle", 0, "strong"),
+        ("interviewing", 1, "fast"),
+        ("interviewing", 5, "fast"),
+        ("interviewing", 6, "strong"),
+        ("interviewing", 0, "strong"),
+        ("finalized", 0, "strong"),
+    ])
+    def test_select_tier(self, state, section, tier):
+        policy = ModelRoutingPolicy(fast_model="flash", strong_model="pro")
+        assert policy.select_tier(state, section) == tier
+
+    def test_from_env_provider_override(self):
+        env = {
+            "QPORT_FAST_MODEL": "generic-fast",
+            "QPORT_FAST_MODEL_GOOGLE": "gemini-flash",
+            "QPORT_STRONG_MODEL": "gemini-pro",
+            "QPORT_STRONG_FROM_SECTION": "5",
+        }
+        policy = ModelRoutingPolicy.from_env("google", environ=env)
+        assert policy.fast_model == "gemini-flash"
+        assert policy.strong_model == "gemini-pro"
+        assert policy.strong_from_section == 5
+        assert ModelRoutingPolicy.from_env("glm", environ=env).fast_model == "generic-fast"
+
+    def test_from_env_disabled_by_default(self):
+        assert ModelRoutingPolicy.from_env("google", environ={}).enabled is False
+
+    def test_strong_from_section_capped_at_final_section(self):
+        policy = ModelRoutingPolicy.from_env(
+            "google", environ={"QPORT_FAST_MODEL": "flash", "QPORT_STRONG_FROM_SECTION": "9"},
+        )
+        assert policy.strong_from_section == 6
+        assert policy.select_tier("interviewing", 6) == "strong"
+
+    def test_final_section_strong_even_with_uncapped_policy(self):
+        policy = ModelRoutingPolicy(fast_model="flash", strong_from_section=9)
+        assert policy.select_tier("interviewing", 6) == "strong"
+
+    def test_invalid_strong_from_section_falls_back(self):
+        policy = ModelRoutingPolicy.from_env(
+            "google", environ={"QPORT_STRONG_FROM_SECTION": "six"},
+        )
+        assert policy.strong_from_section == 6
+
+
+class TestAdapterRouting:
+    def test_send_uses_routed_tier_client(self):
+        default = MockEnhancedClient(MockLLMResponse("default", [], "end_turn"))
+        fast = MockEnhancedClient(MockLLMResponse("fast", [], "end_turn"))
+        strong = MockEnhancedClient(MockLLMResponse("strong", [], "end_turn"))
+        adapter = _LLMClientAdapter(
+            default,
+            tier_clients={"fast": fast, "strong": strong},
+            routing_policy=ModelRoutingPolicy(fast_model="flash", strong_model="pro"),
+        )
+
+        assert adapter.route("interviewing", 2) == "fast"
+        assert adapter.send(messages=[], system="", tools=[]).text == "fast"
+
+        assert adapter.route("finalized", 0) == "strong"
+        assert adapter.send(messages=[], system="", tools=[]).text == "strong"
+
+    def test_missing_tier_client_falls_back_to_default(self):
+        default = MockEnhancedClient(MockLLMResponse("default", [], "end_turn"))
+        fast = MockEnhancedClient(MockLLMResponse("fast", [], "end_turn"))
+        adapter = _LLMClientAdapter(
+            default,
+            tier_clients={"fast": fast},
+            routing_policy=ModelRoutingPolicy(fast_model="flash"),
+        )
+
+        adapter.route("finalized", 0)
+        assert adapter.send(messages=[], system="", tools=[]).text == "default"
+
+    def test_route_without_policy_is_noop(self):
+        adapter = _LLMClientAdapter(MockEnhancedClient(MockLLMResponse("ok", [], "end_turn")))
+        assert adapter.route("interviewing", 2) is None
+        assert adapter.tier is None
+
+
+# ── Mandate Validation ───────────────────────────────────────────
+
+
+def _require_named_list(value):
+    if not isinstance(value, list) or not all("name" in v for v in value):
+        raise ValueError("each sleeve needs a name")
+
+
+_VALIDATORS = {"sleeves": _require_named_list}
+
+
+class MockStreamingClient(MockEnhancedClient):
+    """Enhanced client that streams text deltas, then a final response."""
+
+    def __init__(self, deltas, stop_reason="end_turn", usage=None):
+        super().__init__(MockLLMResponse(content="".join(deltas), tool_calls=[], stop_reason=stop_reason))
+        self._deltas = deltas
+        self._final = MockLLMResponse(content="".join(deltas), tool_calls=[], stop_reason=stop_reason)
+        self._final.usage = usage or {}
+        self.consumed = 0
+        self.stream_calls = []
+
+    def stream_with_tools(self, messages, tools, system_prompt=None):
+        self.stream_calls.append(messages)
+        for delta in self._deltas:
+            self.consumed += 1
+            yield delta
+        yield self._final
+
+
+def _streaming_adapter(client, state="interviewing", section=6):
+    adapter = _LLMClientAdapter(client, section_validators=_VALIDATORS, stream=True)
+    adapter.route(state, section)
+    return adapter
+
+
+class TestAdapterMandateValidation:
+    def test_stream_aborts_on_invalid_section(self):
+        deltas = ['{"fund": "X", ', '"sleeves": [{"allocation": 1.0}]', ', "factors": ', '[]}', " trailing"]
+        client = MockStreamingClient(deltas)
+        adapter = _streaming_adapter(client)
+
+        result = adapter.send(messages=[{"role": "user", "content": "Looks good"}], system="", tools=[])
+
+        assert result.stop_reason == "validation_error"
+        assert client.consumed == 3  # Stopped once the sleeves section closed
+        assert adapter.validation_error.section == "sleeves"
+
+    def test_retry_carries_specific_error(self):
+        client = MockStreamingClient(['{"sleeves": [{}], "fund": "X"}'])
+        adapter = _streaming_adapter(client, state="finalized", section=0)
+        adapter.send(messages=[{"role": "user", "content": "Looks good"}], system="", tools=[])
+
+        retry = [
+            {"role": "user", "content": "Looks good"},
+            {"role": "assistant", "content": '{"sleeves": [{}]'},
+            {"role": "user", "content": "Please output the mandate as a JSON object."},
+        ]
+        adapter.send(messages=retry, system="", tools=[])
+
+        sent = client.stream_calls[-1]
+        assert "JSON validation error in section 'sleeves'" in sent[-1]["content"]
+        assert retry[-1]["content"] == "Please output the mandate as a JSON object."
+
+    def test_valid_stream_passes_stop_reason_and_usage(self):
+        deltas = ['{"sleeves": [{"name": "Main"}]', ', "fund": "X"}']
+        client = MockStreamingClient(deltas, stop_reason="max_tokens", usage={"output_tokens": 42})
+        adapter = _streaming_adapter(client)
+
+        result = adapter.send(messages=[], system="", tools=[])
+
+        assert result.text == "".join(deltas)
+        assert result.stop_reason == "max_tokens"
+        assert result.usage == {"output_tokens": 42}
+        assert adapter.validation_error is None
+
+    def test_interview_turn_not_validated_or_streamed(self):
+        text = 'Section 1/6: Sleeves\n{"sleeves": [{"allocation": 1.0}]}\nDoes this look right?'
+        client = MockStreamingClient([text[i:i + 8] for i in range(0, len(text), 8)])
+        adapter = _streaming_adapter(client, section=1)
+
+        result = adapter.send(messages=[], system="", tools=[])
+
+        assert client.stream_calls == []
+        assert result.text == text
+        assert result.stop_reason == "end_turn"
+        assert adapter.validation_error is None
+
+    def test_streaming_is_opt_in(self):
+        client = MockStreamingClient(['{"sleeves": [{}]}'])
+        adapter = _LLMClientAdapter(client, section_validators=_VALIDATORS)
+        adapter.route("finalized", 0)
+
+        adapter.send(messages=[], system="", tools=[])
+
+        assert client.stream_calls == []
+        assert adapter.validation_error.section == "sleeves"  # Still validated after the fact
+
+    def test_stream_enabled_without_stream_method_falls_back(self):
+        response = MockLLMResponse(content='{"sleeves": [{}]}', tool_calls=[], stop_reason="max_tokens")
+        adapter = _LLMClientAdapter(MockEnhancedClient(response), section_validators=_VALIDATORS, stream=True)
+        adapter.route("finalized", 0)
+
+        result = adapter.send(messages=[], system="", tools=[])
+
+        assert result.stop_reason == "max_tokens"
+        assert adapter.validation_error.section == "sleeves"
+
+    @pytest.mark.parametrize("state,section", [
+        ("idle", 0), ("interviewing", 1), ("interviewing", 5),
+        ("interviewing", 6), ("finalized", 0),
+    ])
+    def test_validation_matches_routing_policy(self, state, section):
+        response = MockLLMResponse(content='{"sleeves": [{}]}', tool_calls=[], stop_reason="end_turn")
+        policy = ModelRoutingPolicy(fast_model="flash", strong_from_section=3)
+        adapter = _LLMClientAdapter(
+            MockEnhancedClient(response), routing_policy=policy, section_validators=_VALIDATORS,
+        )
+        adapter.route(state, section)
+
+        adapter.send(messages=[], system="", tools=[])
+
+        is_mandate_turn = ModelRoutingPolicy.is_mandate_turn(state, section)
+        assert (adapter.validation_error is not None) == is_mandate_turn
+        if is_mandate_turn:
+            assert adapter.tier == "strong"
+
+    def test_unrouted_adapter_does_not_validate(self):
+        response = MockLLMResponse(content='{"sleeves": [{}]}', tool_calls=[], stop_reason="end_turn")
+        adapter = _LLMClientAdapter(MockEnhancedClient(response), section_validators=_VALIDATORS)
+
+        adapter.send(messages=[], system="", tools=[])
+        assert adapter.validation_error is None
+
+    def test_non_streaming_response_validated(self):
+        response = MockLLMResponse(content='{"sleeves": [{}]}', tool_calls=[], stop_reason="end_turn")
+        adapter = _LLMClientAdapter(MockEnhancedClient(response), section_validators=_VALIDATORS)
+        adapter.route("interviewing", 6)
+
+        result = adapter.send(messages=[], system="", tools=[])
+
+        assert result.text == '{"sleeves": [{}]}'
+        assert adapter.validation_error.section == "sleeves"
+
+    def test_route_clears_stale_error(self):
+        response = MockLLMResponse(content='{"sleeves": [{}]}', tool_calls=[], stop_reason="end_turn")
+        adapter = _LLMClientAdapter(MockEnhancedClient(response), section_validators=_VALIDATORS)
+        adapter.route("finalized", 0)
+        adapter.send(messages=[], system="", tools=[])
+
+        adapter.route("interviewing", 2)
+        assert adapter.validation_error is None
+
+
+# ── Factory ──────────────────────────────────────────────────────
+
+
+class TestCreatePlanningAgent:
+    @pytest.fixture
+    def built(self, monkeypatch):
+        """Patch client construction and capture what the factory builds."""
+        import webapp.factory as factory
+
+        calls = []
+
+        def fake_create_enhanced_client(**kwargs):
+            calls.append(kwargs)
+            return MockEnhancedClient(MockLLMResponse("ok", [], "end_turn"))
+
+        for name in ("QPORT_FAST_MODEL", "QPORT_STRONG_MODEL", "QPORT_STRONG_FROM_SECTION",
+                     "QPORT_FAST_MODEL_GOOGLE", "QPORT_STRONG_MODEL_GOOGLE"):
+            monkeypatch.delenv(name, raising=False)
+        monkeypatch.setattr(factory, "create_enhanced_client", fake_create_enhanced_client)
+        monkeypatch.setattr(factory, "PlanningSubAgent", MagicMock())
+        return factory, calls
+
+    def test_one_client_per_configured_tier(self, built, monkeypatch):
+        factory, calls = built
+        monkeypatch.setenv("QPORT_FAST_MODEL", "gemini-flash")
+        monkeypatch.setenv("QPORT_STRONG_MODEL", "gemini-pro")
+
+        factory.create_planning_agent("sess-1", "google")
+
+        assert calls == [
+            {"provider": "google", "verbose": False},
+            {"provider": "google", "model": "gemini-flash", "verbose": False},
+            {"provider": "google", "model": "gemini-pro", "verbose": False},
+        ]
+        adapter = factory.PlanningSubAgent.call_args.kwargs["llm_client"]
+        assert adapter.route("interviewing", 2) == "fast"
+
+    def test_only_configured_tiers_get_clients(self, built, monkeypatch):
+        factory, calls = built
+        monkeypatch.setenv("QPORT_FAST_MODEL", "gemini-flash")
+
+        factory.create_planning_agent("sess-1", "google")
+
+        assert [c.get("model") for c in calls] == [None, "gemini-flash"]
+
+    def test_no_extra_clients_when_routing_off(self, built):
+        factory, calls = built
+
+        factory.create_planning_agent("sess-1", "google")
+
+        assert calls == [{"provider": "google", "verbose": False}]
+        adapter = factory.PlanningSubAgent.call_args.kwargs["llm_client"]
+        assert adapter.route("interviewing", 2) is None
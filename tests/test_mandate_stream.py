@@ -0,0 +1,114 @@
+"""Unit tests for incremental mandate JSON validation."""
+import json
+
+import pytest
+
+from webapp.mandate_stream import IncrementalMandateValidator, MandateStreamError
+
+
+def _require_list(value):
+    if not isinstance(value, list):
+        raise ValueError("expected a list")
+    for item in value:
+        if "name" not in item:
+            raise ValueError("missing field 'name'")
+
+
+VALIDATORS = {"sleeves": _require_list, "factors": _require_list}
+
+VALID_MANDATE = {
+    "version": "1.0",
+    "fund": "SP500 {Multifactor}",
+    "sleeves": [{"name": "Main", "allocation": 1.0}],
+    "factors": [{"name": "value"}, {"name": "momentum \"12-1\""}],
+}
+
+
+def _feed_chunks(validator, text, size=7):
+    for i in range(0, len(text), size):
+        validator.feed(text[i:i + size])
+
+
+class TestIncrementalMandateValidator:
+    def test_valid_mandate_streams_through(self):
+        text = "Here is the mandate:\n```json\n" + json.dumps(VALID_MANDATE, indent=2) + "\n```"
+        validator = IncrementalMandateValidator(VALIDATORS)
+        _feed_chunks(validator, text)
+        assert validator.done
+        assert validator.validated_sections == ["sleeves", "factors"]
+
+    def test_invalid_section_raises_when_it_closes(self):
+        bad = dict(VALID_MANDATE, sleeves=[{"allocation": 1.0}])
+        text = json.dumps(bad)
+        cut = text.index('"factors"')
+        validator = IncrementalMandateValidator(VALIDATORS)
+
+        with pytest.raises(MandateStreamError) as exc:
+            _feed_chunks(validator, text[:cut])
+        assert exc.value.section == "sleeves"
+        assert "name" in exc.value.detail
+        assert "sleeves" in exc.value.retry_message()
+
+    def test_last_section_validated_on_object_close(self):
+        bad = dict(VALID_MANDATE, factors={"name": "value"})
+        validator = IncrementalMandateValidator(VALIDATORS)
+        with pytest.raises(MandateStreamError) as exc:
+            validator.feed(json.dumps(bad))
+        assert exc.value.section == "factors"
+
+    def test_malformed_section_json(self):
+        validator = IncrementalMandateValidator(VALIDATORS)
+        with pytest.raises(MandateStreamError, match="malformed JSON"):
+            validator.feed('{"sleeves": [{"name": "Main",}], "fund": "X"}')
+
+    def test_prose_braces_ignored(self):
+        validator = IncrementalMandateValidator(VALIDATORS)
+        validator.feed("Section 3/6: Factors {value, momentum} blended equally?")
+        assert not validator.done
+        assert validator.validated_sections == []
+
+    def test_unvalidated_sections_skipped(self):
+        validator = IncrementalMandateValidator(VALIDATORS)
+        validator.feed('{"fund": "X", "overlay": {"type": [1, 2]}}')
+        assert not validator.done  # Not the mandate; keep scanning
+        assert validator.validated_sections == []
+
+    def test_no_validators_is_noop(self):
+        validator = IncrementalMandateValidator({})
+        validator.feed('{"sleeves": 5}')
+        assert not validator.done
+
+
+class TestScanning:
+    def test_skips_objects_without_validated_sections(self):
+        validator = IncrementalMandateValidator(VALIDATORS)
+        validator.feed('Weights {"value": 0.5} then: {"sleeves": [{"name": "M"}]}')
+        assert validator.done
+        assert validator.validated_sections == ["sleeves"]
+
+    def test_invalid_mandate_after_other_object_raises(self):
+        validator = IncrementalMandateValidator(VALIDATORS)
+        with pytest.raises(MandateStreamError):
+            validator.feed('Weights {"value": 0.5} then: {"sleeves": [{}]}')
+
+
+def test_missing_schema_disables_validation(monkeypatch):
+    import builtins
+    from webapp import mandate_stream
+
+    real_import = builtins.__import__
+
+    def no_schema(name, *args, **kwargs):
+        if name.startswith("qport_agent") or name == "pydantic":
+            raise ImportError(name)
+        return real_import(name, *args, **kwargs)
+
+    mandate_stream.mandate_section_validators.cache_clear()
+    monkeypatch.setattr(builtins, "__import__", no_schema)
+    try:
+        assert mandate_stream.mandate_section_validators() == {}
+        validator = IncrementalMandateValidator()
+        validator.feed('{"sleeves": 5}')
+        assert validator.validated_sections == []
+    finally:
+        mandate_stream.mandate_section_validators.cache_clear()
@@ -56,12 +56,16 @@ SAMPLE_RESULT = {
 }
 
 
-def _make_agent(mock_orch=None):
+def _make_agent(mock_orch=None, llm_client=None):
     """Create a PlanningSubAgent with a mocked orchestrator."""
     agent = PlanningSubAgent.__new__(PlanningSubAgent)
     agent.orchestrator = mock_orch or MockOrchestrator()
+    agent._llm_client = llm_client
     agent._progress = None
+    agent._session_id = "sess-test"
+    agent._audit_log = None
     agent._state = "idle"
+    agent._section = 0
     agent._last_mandate = None
     agent._last_llm_responses = []
     return agent
@@ -265,6 +269,136 @@ class TestSubAgentABC:
         assert stats["search_queries"] == 0
 
 
+# ── Model Routing Signals ─────────────────────────────────────────
+
+
+class RecordingRouter:
+    """LLM client stub that records the routing signals it receives."""
+
+    def __init__(self):
+        self.calls = []
+
+    def route(self, state, section):
+        self.calls.append((state, section))
+        return "fast"
+
+
+class TestModelRouting:
+    def test_section_tracked_from_interview_text(self):
+        from qport_agent.orchestrator import PlanningNeedsInput
+
+        orch = MockOrchestrator()
+        orch._plan_exception = PlanningNeedsInput("**Section 2/6: Filters**\nNo exclusions.")
+        agent = _make_agent(orch)
+
+        agent.chat("Build a portfolio")
+        assert agent._section == 2
+
+    def test_route_called_with_state_and_section(self):
+        from qport_agent.orchestrator import PlanningNeedsInput
+
+        orch = MockOrchestrator()
+        orch._continue_exception = PlanningNeedsInput("Section 4/6: Constraints")
+        router = RecordingRouter()
+        agent = _make_agent(orch, llm_client=router)
+        agent._state = "interviewing"
+        agent._section = 3
+
+        agent.chat("Looks good")
+        agent.chat("Looks good")
+        assert router.calls == [("interviewing", 3), ("interviewing", 4)]
+
+    def test_finalize_and_reset_clear_section(self):
+        orch = MockOrchestrator()
+        orch._continue_result = SAMPLE_RESULT
+        agent = _make_agent(orch)
+        agent._state = "interviewing"
+        agent._section = 6
+
+        agent.chat("Looks good")
+        assert agent._section == 0
+
+        agent._section = 3
+        agent.reset_conversation()
+        assert agent._section == 0
+
+    @pytest.mark.parametrize("text,expected", [
+        ("Section 1/6: Sleeves", 1),
+        ("Confirmed section 2/6. Section 3 / 6: Factors", 3),
+        ("What benchmark would you like?", 0),
+    ])
+    def test_parse_section(self, text, expected):
+        assert PlanningSubAgent._parse_section(text) == expected
+
+
+# ── Audit Log Events ─────────────────────────────────────────────
+
+
+class RecordingAuditLog:
+    """AuditLogWriter stub that keeps emitted events in memory."""
+
+    def __init__(self):
+        self.events = []
+
+    def emit(self, event_type, session_id, **fields):
+        self.events.append((event_type, session_id, fields))
+        return True
+
+
+class TestAuditEvents:
+    def test_finalize_emits_mandate_and_turn(self):
+        orch = MockOrchestrator()
+        orch._plan_result = SAMPLE_RESULT
+        agent = _make_agent(orch)
+        agent._audit_log = RecordingAuditLog()
+
+        response = agent.chat("S&P 500 value tilt")
+        events = agent._audit_log.events
+        assert [e[0] for e in events] == ["mandate", "turn"]
+        assert all(e[1] == "sess-test" for e in events)
+        assert events[0][2]["mandate"] == SAMPLE_MANDATE
+        assert events[0][2]["export_id"] == response.metadata["export_id"]
+        assert events[1][2]["next_state"] == "finalized"
+
+    def test_revision_event(self):
+        orch = MockOrchestrator()
+        orch._revise_result = SAMPLE_RESULT
+        agent = _make_agent(orch)
+        agent._state = "finalized"
+        agent._audit_log = RecordingAuditLog()
+
+        agent.chat("Change weight limit to 3%")
+        assert agent._audit_log.events[0][0] == "revision"
+
+    def test_error_event(self):
+        orch = MockOrchestrator()
+        orch._continue_exception = ValueError("bad mandate")
+        agent = _make_agent(orch)
+        agent._state = "interviewing"
+        agent._audit_log = RecordingAuditLog()
+
+        agent.chat("Use all defaults")
+        event, _, fields = agent._audit_log.events[0]
+        assert event == "error"
+        assert fields["error"] == "bad mandate"
+
+    def test_audit_failure_does_not_break_chat(self):
+        orch = MockOrchestrator()
+        orch._plan_result = SAMPLE_RESULT
+        agent = _make_agent(orch)
+        agent._audit_log = MagicMock()
+        agent._audit_log.emit.side_effect = OSError("disk full")
+
+        response = agent.chat("S&P 500 value tilt")
+        assert response.status == "success"
+
+    def test_export_id_is_content_hash(self):
+        a = PlanningSubAgent._export_id({"fund": "X", "version": "1.0"})
+        b = PlanningSubAgent._export_id({"version": "1.0", "fund": "X"})
+        assert a == b
+        assert a != PlanningSubAgent._export_id({"fund": "Y", "version": "1.0"})
+
+
 # ── Start Over Detection ─────────────────────────────────────────
 
 
@@ -0,0 +1,221 @@
+"""Append-only transcript and mandate audit log, written off the chat() hot path.
+
+PlanningSubAgent emits events (turns, mandates, revisions, errors, usage) with
+emit(), which never blocks: events go onto a bounded in-memory queue and are
+dropped — and counted — when the queue is full. A daemon thread drains the
+queue in batches into gzip-compressed JSONL segments that rotate by size, and
+appends one line per event to ``index.jsonl`` so records can be located by
+session id or export id without decompressing every segment.
+"""
+import atexit
+import gzip
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+_SEGMENT_PREFIX = "transcript-"
+_SEGMENT_SUFFIX = ".jsonl.gz"
+_INDEX_FILE = "index.jsonl"
+
+
+class AuditLogWriter:
+    """Background writer for rotating, compressed JSONL audit segments."""
+
+    def __init__(
+        self,
+        directory,
+        max_queue: int = 10_000,
+        batch_size: int = 256,
+        flush_interval: float = 1.0,
+        segment_max_bytes: int = 64 * 1024 * 1024,
+    ):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._segment_max_bytes = segment_max_bytes
+        self._segment = None
+        self._segment_records = 0
+        self._segment_bytes = 0
+        self._pending_index: list[str] = []  # Written to a segment, not yet indexed
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            "enqueued": 0, "written": 0, "dropped": 0, "failed": 0,
+            "index_failed": 0, "segments": 0,
+        }
+        self._closed = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="qport-audit-log", daemon=True)
+        self._thread.start()
+
+    # ── Producer side ─────────────────────────────────────────────
+
+    def emit(self, event_type: str, session_id: Optional[str], **fields) -> bool:
+        """Queue an event without blocking. Returns False if it was dropped."""
+        if self._closed.is_set():
+            self._count("dropped")
+            return False
+        record = {"ts": time.time(), "event": event_type, "session_id": session_id, **fields}
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self._count("dropped")
+            return False
+        self._count("enqueued")
+        return True
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats["queued"] = self._queue.qsize()
+        stats["unindexed"] = len(self._pending_index)
+        return stats
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Stop accepting events and flush what is already queued."""
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        self._thread.join(timeout)
+
+    # ── Writer thread ─────────────────────────────────────────────
+
+    def _run(self):
+        while not (self._closed.is_set() and self._queue.empty()):
+            batch = self._next_batch()
+            if batch:
+                try:
+                    self._write_batch(batch)
+                except Exception:
+                    self._count("failed", len(batch))
+                    logger.exception("Audit log batch write failed")
+            if self._pending_index:
+                self._flush_index()
+
+    def _next_batch(self) -> list[dict]:
+        try:
+            batch = [self._queue.get(timeout=self._flush_interval)]
+        except queue.Empty:
+            return []
+        while len(batch) < self._batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _write_batch(self, batch: list[dict]):
+        lines = [json.dumps(r, default=str, separators=(",", ":")) + "\n" for r in batch]
+        if self._segment is None or self._segment_bytes >= self._segment_max_bytes:
+            self._rotate()
+        start = self._segment_records
+        # Each batch is appended as its own gzip member; readers see one stream
+        try:
+            with gzip.open(self._segment, "at", encoding="utf-8") as f:
+                f.writelines(lines)
+        except Exception:
+            # Part of the batch (or a truncated member) may be in the segment,
+            # so line numbers past this point are unknown: start a new one
+            self._rotate()
+            raise
+        self._segment_records += len(lines)
+        self._segment_bytes = os.path.getsize(self._segment)
+        self._count("written", len(batch))
+
+        self._pending_index.extend(
+            json.dumps({
+                "session_id": record.get("session_id"),
+                "export_id": record.get("export_id"),
+                "event": record["event"],
+                "ts": record["ts"],
+                "segment": self._segment.name,
+                "line": start + offset,
+            }, separators=(",", ":")) + "\n"
+            for offset, record in enumerate(batch)
+        )
+
+    def _flush_index(self):
+        """Append pending index entries; on failure keep them for the next batch.
+
+        Appends always start on a fresh line, so a fragment left by a failed
+        or crashed append cannot corrupt the next entry; lookup() skips the
+        fragment and de-duplicates entries written twice.
+        """
+        try:
+            with open(self.directory / _INDEX_FILE, "a+b") as f:
+                f.seek(0, os.SEEK_END)
+                prefix = b""
+                if f.tell():
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b"\n":
+                        prefix = b"\n"
+                f.write(prefix + "".join(self._pending_index).encode("utf-8"))
+        except OSError:
+            self._count("index_failed", len(self._pending_index))
+            logger.exception("Audit log index write failed; will retry")
+            return
+        self._pending_index = []
+
+    def _rotate(self):
+        stamp = time.strftime("%Y%m%dT%H%M%S", time.gmtime())
+        seq = self._stats["segments"]
+        self._segment = self.directory / f"{_SEGMENT_PREFIX}{stamp}-{os.getpid()}-{seq:05d}{_SEGMENT_SUFFIX}"
+        self._segment_records = 0
+        self._segment_bytes = 0
+        self._count("segments")
+
+    def _count(self, key: str, n: int = 1):
+        with self._stats_lock:
+            self._stats[key] += n
+
+
+def lookup(directory, session_id: Optional[str] = None, export_id: Optional[str] = None) -> list[dict]:
+    """Return logged events matching a session id and/or export id, in order."""
+    directory = Path(directory)
+    index_path = directory / _INDEX_FILE
+    if not index_path.exists():
+        return []
+    wanted: dict[str, set[int]] = {}
+    with open(index_path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # Blank line or fragment left by a failed index append
+            if session_id is not None and entry["session_id"] != session_id:
+                continue
+            if export_id is not None and entry["export_id"] != export_id:
+                continue
+            wanted.setdefault(entry["segment"], set()).add(entry["line"])
+    records = []
+    for segment in sorted(wanted):
+        with gzip.open(directory / segment, "rt", encoding="utf-8") as f:
+            records.extend(json.loads(line) for i, line in enumerate(f) if i in wanted[segment])
+    return records
+
+
+_shared_writer: Optional[AuditLogWriter] = None
+_shared_lock = threading.Lock()
+
+
+def get_audit_log() -> Optional[AuditLogWriter]:
+    """Process-wide writer configured by ``QPORT_AUDIT_LOG_DIR`` (None if unset)."""
+    global _shared_writer
+    directory = os.environ.get("QPORT_AUDIT_LOG_DIR")
+    if not directory:
+        return None
+    with _shared_lock:
+        if _shared_writer is None:
+            _shared_writer = AuditLogWriter(
+                directory,
+                max_queue=int(os.environ.get("QPORT_AUDIT_LOG_QUEUE", 10_000)),
+            )
+            atexit.register(_shared_writer.close)
+    return _shared_writer
@@ -1,23 +1,157 @@
 """Agent factory for the qport Planning Agent standalone webapp."""
+import logging
+import os
+from dataclasses import dataclass
+from typing import Optional
+
 from fast_framework.contracts import SubAgent
 from fast_framework.llm.enhanced_client import create_enhanced_client
 from qport_agent.llm.client import AgentMessage, ToolCall as QportToolCall
+from .audit_log import get_audit_log
+from .mandate_stream import IncrementalMandateValidator, MandateStreamError
 from .sub_agent import PlanningSubAgent
 
+logger = logging.getLogger(__name__)
+
+# Model tiers selected by ModelRoutingPolicy
+FAST_TIER = "fast"
+STRONG_TIER = "strong"
+
+# Confirming this interview section makes the next turn emit the mandate JSON
+_FINAL_SECTION = 6
+
+
+@dataclass(frozen=True)
+class ModelRoutingPolicy:
+    """Chooses a model tier for each turn from the PlanningSubAgent state.
+
+    Routine interview turns (section summaries, "Looks good", "Show details")
+    go to the fast tier. The opening request, the turn that follows the final
+    confirmation section (where the mandate JSON is emitted) and revisions of
+    a finalized mandate go to the strong tier.
+
+    A tier with no model configured falls back to the provider default.
+    """
+
+    fast_model: Optional[str] = None
+    strong_model: Optional[str] = None
+    strong_from_section: int = _FINAL_SECTION  # Capped at the final section
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.fast_model or self.strong_model)
+
+    @staticmethod
+    def is_mandate_turn(state: str, section: int) -> bool:
+        """True for turns that emit mandate JSON: after the final section is
+        shown, and revisions of a finalized mandate."""
+        return state == "finalized" or (state == "interviewing" and section >= _FINAL_SECTION)
+
+    def select_tier(self, state: str, section: int) -> str:
+        # Mandate turns are always strong, whatever the threshold
+        if self.is_mandate_turn(state, section):
+            return STRONG_TIER
+        if state == "interviewing" and 0 < section < self.strong_from_section:
+            return FAST_TIER
+        return STRONG_TIER
+
+    def model_for(self, tier: str) -> Optional[str]:
+        return self.fast_model if tier == FAST_TIER else self.strong_model
+
+    @classmethod
+    def from_env(cls, provider: str, environ=None) -> "ModelRoutingPolicy":
+        """Build the policy from deployment environment variables.
+
+        ``QPORT_FAST_MODEL`` / ``QPORT_STRONG_MODEL`` apply to every provider;
+        a ``_<PROVIDER>`` suffix (e.g. ``QPORT_FAST_MODEL_GOOGLE``) overrides
+        them for one provider. ``QPORT_STRONG_FROM_SECTION`` moves the
+        threshold at which interview turns switch to the strong tier.
+        """
+        env = os.environ if environ is None else environ
+        suffix = f"_{provider.upper()}"
+
+        def _get(name):
+            return env.get(name + suffix) or env.get(name) or None
+
+        strong_from_section = _FINAL_SECTION
+        raw = _get("QPORT_STRONG_FROM_SECTION")
+        if raw is not None:
+            try:
+                strong_from_section = min(int(raw), _FINAL_SECTION)
+            except ValueError:
+                logger.warning(
+                    f"Invalid QPORT_STRONG_FROM_SECTION={raw!r}; using {_FINAL_SECTION}"
+                )
+
+        return cls(
+            fast_model=_get("QPORT_FAST_MODEL"),
+            strong_model=_get("QPORT_STRONG_MODEL"),
+            strong_from_section=strong_from_section,
+        )
+
 
 class _LLMClientAdapter:
     """Adapts EnhancedLLMClient (.complete_with_tools) to the qport-agent
-    LLMClient interface (.send) expected by QportOrchestrator."""
+    LLMClient interface (.send) expected by QportOrchestrator.
+
+    With a routing policy, PlanningSubAgent calls route() before each turn
+    and send() dispatches to the client registered for the selected tier.
 
-    def __init__(self, enhanced_client):
+    On turns that emit mandate JSON (after the final section, and revisions)
+    the response is validated section by section and the specific error is
+    appended to the orchestrator's next retry prompt. Interview turns are
+    never validated or streamed.
+
+    ``stream=True`` routes those turns through a client ``.stream_with_tools``
+    so a bad section aborts early. No fast-framework client is known to
+    provide that method — the contract is ours and unverified — so clients
+    without it fall back to validating the complete response.
+    """
+
+    def __init__(self, enhanced_client, tier_clients=None, routing_policy=None,
+                 section_validators=None, stream=False):
         self._client = enhanced_client
+        self._tier_clients = tier_clients or {}
+        self._policy = routing_policy
+        self._tier = None
+        self._section_validators = section_validators
+        self._stream = stream
+        self._validate_turn = False
+        self._validation_error: Optional[MandateStreamError] = None
+
+    @property
+    def tier(self) -> Optional[str]:
+        return self._tier
+
+    @property
+    def validation_error(self) -> Optional[MandateStreamError]:
+        return self._validation_error
+
+    def route(self, state: str, section: int) -> Optional[str]:
+        """Select the model tier for the next turn. Returns the tier, or None
+        when routing is disabled."""
+        self._validation_error = None  # New PM turn — drop stale retry feedback
+        self._validate_turn = ModelRoutingPolicy.is_mandate_turn(state, section)
+        if self._policy is None:
+            return None
+        self._tier = self._policy.select_tier(state, section)
+        return self._tier
 
     def send(self, messages, system, tools):
-        resp = self._client.complete_with_tools(
+        client = self._tier_clients.get(self._tier, self._client)
+        messages = self._with_validation_feedback(messages)
+        system_prompt = system if isinstance(system, str) else None
+        if (self._stream and self._validate_turn and not tools
+                and hasattr(client, "stream_with_tools")):
+            return self._send_streaming(client, messages, system_prompt)
+
+        resp = client.complete_with_tools(
             messages=messages,
             tools=tools,
-            system_prompt=system if isinstance(system, str) else None,
+            system_prompt=system_prompt,
         )
+        if self._validate_turn and not resp.tool_calls:
+            self._validate(resp.content)
         # Convert fast-framework ToolCall → qport-agent ToolCall
         tool_calls = [
             QportToolCall(id=tc.id, name=tc.name, input=tc.input)
@@ -30,6 +164,59 @@ class _LLMClientAdapter:
             usage={},
         )
 
+    def _send_streaming(self, client, messages, system_prompt):
+        """Consume a stream, aborting at the first invalid mandate section.
+
+        Expects .stream_with_tools to yield ``str`` text deltas followed by a
+        final response object carrying ``stop_reason`` and ``usage``.
+        """
+        validator = IncrementalMandateValidator(self._section_validators)
+        chunks = []
+        stop_reason, usage = None, {}
+        events = client.stream_with_tools(messages=messages, tools=[], system_prompt=system_prompt)
+        try:
+            for event in events:
+                if isinstance(event, str):
+                    chunks.append(event)
+                    validator.feed(event)
+                else:
+                    stop_reason = getattr(event, "stop_reason", None) or stop_reason
+                    usage = getattr(event, "usage", None) or usage
+        except MandateStreamError as e:
+            self._validation_error = e
+            stop_reason = "validation_error"
+        finally:
+            close = getattr(events, "close", None)
+            if close is not None:
+                close()
+        if stop_reason is None:
+            logger.warning("Stream ended without a stop_reason; assuming end_turn")
+            stop_reason = "end_turn"
+        return AgentMessage(
+            text="".join(chunks),
+            tool_calls=[],
+            stop_reason=stop_reason,
+            usage=dict(usage),
+        )
+
+    def _validate(self, text: str) -> None:
+        try:
+            IncrementalMandateValidator(self._section_validators).feed(text or "")
+        except MandateStreamError as e:
+            self._validation_error = e
+
+    def _with_validation_feedback(self, messages):
+        """Append the last section error to the retry prompt, once."""
+        error, self._validation_error = self._validation_error, None
+        if error is None:
+            return messages
+        feedback = error.retry_message()
+        if messages and messages[-1].get("role") == "user" and isinstance(messages[-1].get("content"), str):
+            last = dict(messages[-1])
+            last["content"] = f"{last['content']}\n\n{feedback}"
+            return [*messages[:-1], last]
+        return [*messages, {"role": "user", "content": feedback}]
+
 
 def create_planning_agent(
     session_id: str,
@@ -42,8 +229,24 @@ def create_planning_agent(
         (session_id, provider, progress_callback) -> SubAgent
     """
     enhanced_client = create_enhanced_client(provider=provider, verbose=False)
-    llm_client = _LLMClientAdapter(enhanced_client)
+    policy = ModelRoutingPolicy.from_env(provider)
+    tier_clients = {}
+    if policy.enabled:
+        for tier in (FAST_TIER, STRONG_TIER):
+            model = policy.model_for(tier)
+            if model:
+                tier_clients[tier] = create_enhanced_client(
+                    provider=provider, model=model, verbose=False,
+                )
+    llm_client = _LLMClientAdapter(
+        enhanced_client,
+        tier_clients=tier_clients,
+        routing_policy=policy if policy.enabled else None,
+        stream=os.environ.get("QPORT_STREAM_VALIDATION", "").lower() in ("1", "true", "yes"),
+    )
     return PlanningSubAgent(
         llm_client=llm_client,
         progress_callback=progress_callback,
+        session_id=session_id,
+        audit_log=get_audit_log(),
     )
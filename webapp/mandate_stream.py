@@ -0,0 +1,154 @@
+"""Incremental validation of mandate JSON as the model streams it.
+
+The validator scans text chunks for the top-level mandate object and, as each
+top-level section closes (sleeves, filters, factors, constraints), parses and
+validates it against the matching field of the qport ``Mandate`` schema. An
+invalid section raises MandateStreamError immediately, so the caller can abort
+the generation and retry with the specific error instead of waiting for the
+last token.
+"""
+import json
+import logging
+from functools import lru_cache
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+MANDATE_SECTIONS = ("sleeves", "filters", "factors", "constraints")
+
+
+class MandateStreamError(ValueError):
+    """A completed top-level mandate section failed validation."""
+
+    def __init__(self, section: str, detail: str):
+        self.section = section
+        self.detail = detail
+        super().__init__(f"section '{section}': {detail}")
+
+    def retry_message(self) -> str:
+        return (
+            f"JSON validation error in section '{self.section}': {self.detail}\n\n"
+            "Fix the error and output only valid JSON."
+        )
+
+
+@lru_cache(maxsize=1)
+def mandate_section_validators() -> dict[str, Callable]:
+    """Validators for the top-level sections declared on the Mandate model.
+
+    Returns an empty dict — validation off — if the schema can't be imported.
+    """
+    try:
+        from pydantic import TypeAdapter
+        from qport_agent.mandate.schema import Mandate
+    except ImportError:
+        logger.warning("Mandate schema unavailable; streamed validation disabled", exc_info=True)
+        return {}
+
+    validators = {}
+    for name in MANDATE_SECTIONS:
+        field = Mandate.model_fields.get(name)
+        if field is not None:
+            validators[name] = TypeAdapter(field.annotation).validate_python
+    return validators
+
+
+class IncrementalMandateValidator:
+    """Feed streamed text with feed(); raises MandateStreamError on the first
+    invalid section. Text around the mandate object (prose, code fences) is
+    ignored, as are JSON objects that contain none of the validated sections;
+    scanning stops after the first object that does."""
+
+    def __init__(self, section_validators: Optional[dict[str, Callable]] = None):
+        self._validators = (
+            mandate_section_validators() if section_validators is None else section_validators
+        )
+        self._buf = ""
+        self._pos = 0
+        self._depth = 0  # 0 = outside the mandate object
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._expect_key = False
+        self._key = None
+        self._value_start = None
+        self._has_section = False  # Current object contains a validated section
+        self.done = False
+        self.validated_sections: list[str] = []
+
+    def feed(self, chunk: str) -> None:
+        if self.done or not self._validators:
+            return
+        self._buf += chunk
+        while self._pos < len(self._buf) and not self.done:
+            if self._depth == 0:
+                if not self._find_start():
+                    return
+                continue
+            self._step(self._buf[self._pos])
+            self._pos += 1
+
+    def _find_start(self) -> bool:
+        """Advance to a '{' that opens a JSON object with a string key.
+        Returns False when more input is needed to decide."""
+        while self._pos < len(self._buf):
+            if self._buf[self._pos] != "{":
+                self._pos += 1
+                continue
+            rest = self._buf[self._pos + 1:].lstrip()
+            if not rest:
+                return False
+            if rest[0] == '"':
+                self._depth = 1
+                self._expect_key = True
+                self._pos += 1
+                return True
+            self._pos += 1
+        return False
+
+    def _step(self, ch: str) -> None:
+        if self._in_string:
+            if self._escape:
+                self._escape = False
+            elif ch == "\\":
+                self._escape = True
+            elif ch == '"':
+                self._in_string = False
+                if self._depth == 1 and self._expect_key:
+                    self._key = json.loads(self._buf[self._string_start:self._pos + 1])
+                    self._expect_key = False
+            return
+
+        if ch == '"':
+            self._in_string = True
+            self._string_start = self._pos
+        elif ch in "{[":
+            self._depth += 1
+        elif ch in "}]":
+            if self._depth == 1:
+                self._close_section()
+                self.done = self._has_section  # Otherwise keep looking
+            self._depth -= 1
+        elif self._depth == 1:
+            if ch == ":":
+                self._value_start = self._pos + 1
+            elif ch == ",":
+                self._close_section()
+                self._expect_key = True
+
+    def _close_section(self) -> None:
+        key, start = self._key, self._value_start
+        self._key, self._value_start = None, None
+        if key not in self._validators or start is None:
+            return
+        self._has_section = True
+        raw = self._buf[start:self._pos]
+        try:
+            value = json.loads(raw)
+        except json.JSONDecodeError as e:
+            raise MandateStreamError(key, f"malformed JSON: {e.msg}") from e
+        try:
+            self._validators[key](value)
+        except ValueError as e:
+            raise MandateStreamError(key, str(e)) from e
+        self.validated_sections.append(key)
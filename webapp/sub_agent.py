@@ -1,6 +1,8 @@
 """PlanningSubAgent — wraps the qport Planning Agent for the FAST standalone webapp."""
+import hashlib
 import json
 import logging
+import re
 from typing import Optional
 
 from fast_framework.contracts import SubAgent, AgentResponse, ActionChip, AgentCapabilities
@@ -22,6 +24,9 @@ _FINALIZED_CHIPS = [
 
 _START_OVER_PHRASES = {"start over", "start fresh", "reset", "new mandate", "begin again"}
 
+# Interview prompt requires "Section N/6: [Name]" headers
+_SECTION_HEADER = re.compile(r"Section\s+(\d+)\s*/\s*6", re.IGNORECASE)
+
 
 class PlanningSubAgent(SubAgent):
     """SubAgent that wraps the qport Planning Agent for interactive mandate building.
@@ -34,10 +39,14 @@ class PlanningSubAgent(SubAgent):
 
     MAX_TURNS = 1  # No tool-calling loop — each chat() is one LLM round-trip
 
-    def __init__(self, llm_client, progress_callback=None):
+    def __init__(self, llm_client, progress_callback=None, session_id=None, audit_log=None):
         self.orchestrator = QportOrchestrator(llm_client)
+        self._llm_client = llm_client
         self._progress = progress_callback
+        self._session_id = session_id
+        self._audit_log = audit_log  # AuditLogWriter or None
         self._state = "idle"  # idle | interviewing | finalized
+        self._section = 0  # Last interview section shown to the PM (0 = none)
         self._last_mandate = None
         self._last_llm_responses = []
 
@@ -45,6 +54,23 @@ class PlanningSubAgent(SubAgent):
 
     def chat(self, message: str, context: Optional[dict] = None) -> AgentResponse:
         """Route message to the correct orchestrator method based on state."""
+        self._route_model()
+        state = self._state
+        response = self._dispatch(message)
+        self._audit(
+            "turn",
+            state=state,
+            next_state=self._state,
+            section=self._section,
+            tier=getattr(self._llm_client, "tier", None),
+            message=message,
+            status=response.status,
+            reasoning=response.reasoning,
+            usage=dict(getattr(self.orchestrator, "_planning_usage", None) or {}),
+        )
+        return response
+
+    def _dispatch(self, message: str) -> AgentResponse:
         try:
             if self._state == "idle":
                 return self._start_planning(message)
@@ -54,6 +80,7 @@ class PlanningSubAgent(SubAgent):
                 return self._handle_revision(message)
         except PlanningNeedsInput as e:
             self._state = "interviewing"
+            self._section = self._parse_section(e.text) or self._section
             return AgentResponse(
                 status="partial",
                 data=None,
@@ -62,6 +89,7 @@ class PlanningSubAgent(SubAgent):
             )
         except RuntimeError as e:
             logger.error(f"Planning runtime error: {e}")
+            self._audit("error", state=self._state, error_type="RuntimeError", error=str(e))
             return AgentResponse(
                 status="error",
                 data=None,
@@ -70,6 +98,7 @@ class PlanningSubAgent(SubAgent):
             )
         except ValueError as e:
             logger.error(f"Planning parse error: {e}")
+            self._audit("error", state=self._state, error_type="ValueError", error=str(e))
             return AgentResponse(
                 status="error",
                 data=None,
@@ -111,6 +140,7 @@ class PlanningSubAgent(SubAgent):
 
     def reset_conversation(self) -> None:
         self._state = "idle"
+        self._section = 0
         self._last_mandate = None
         self._last_llm_responses = []
         # Reset orchestrator planning state
@@ -154,25 +184,58 @@ class PlanningSubAgent(SubAgent):
         self._report_progress("on_llm_start")
         result = self.orchestrator.revise_plan(message)
         self._report_progress("on_response_ready")
-        return self._finalize(result)
+        return self._finalize(result, event="revision")
 
-    def _finalize(self, result: dict) -> AgentResponse:
+    def _finalize(self, result: dict, event: str = "mandate") -> AgentResponse:
         """Wrap a completed mandate result into an AgentResponse."""
         self._state = "finalized"
+        self._section = 0
         self._last_mandate = result["mandate"]
         self._last_llm_responses = []
         # Extract usage if available
         usage = result.get("usage", {})
         if usage:
             self._last_llm_responses = [usage]
+        export_id = self._export_id(result["mandate"])
+        self._audit(event, export_id=export_id, mandate=result["mandate"], usage=usage)
         return AgentResponse(
             status="success",
             data={"mandate": result["mandate"]},
             reasoning=result["text"],
             action_chips=list(_FINALIZED_CHIPS),
-            metadata={"mandate_version": "1.0"},
+            metadata={"mandate_version": "1.0", "export_id": export_id},
         )
 
+    @staticmethod
+    def _export_id(mandate: dict) -> str:
+        """Content hash of the mandate — identifies it in the audit log."""
+        canonical = json.dumps(mandate, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(canonical.encode()).hexdigest()[:16]
+
+    def _audit(self, event: str, **fields):
+        """Queue an audit event; never blocks or raises into chat()."""
+        if self._audit_log is None:
+            return
+        try:
+            self._audit_log.emit(event, self._session_id, **fields)
+        except Exception:
+            logger.debug(f"Audit log error: {event}", exc_info=True)
+
+    def _route_model(self):
+        """Let a routing-aware LLM client pick the model tier for this turn."""
+        route = getattr(self._llm_client, "route", None)
+        if route is None:
+            return
+        tier = route(self._state, self._section)
+        if tier:
+            logger.debug(f"Model tier {tier} (state={self._state}, section={self._section})")
+
+    @staticmethod
+    def _parse_section(text: str) -> int:
+        """Return the last "Section N/6" number in an interview turn, or 0."""
+        matches = _SECTION_HEADER.findall(text or "")
+        return int(matches[-1]) if matches else 0
+
     def _is_start_over(self, message: str) -> bool:
         """Check if the user wants to start a completely new mandate."""
         normalized = message.strip().lower()